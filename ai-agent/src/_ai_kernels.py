@@ -0,0 +1,35 @@
+"""
+_ai_kernels.py
+Numba-compiled numeric kernels for the allocation hot path
+Falls back to plain NumPy when numba is not installed
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional - without it the kernels run as plain NumPy
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+@njit(cache=True)
+def risk_adjust_allocate(yields: np.ndarray, risks: np.ndarray,
+                         min_alloc: float) -> np.ndarray:
+    """
+    Risk-adjust yields into allocation weights:
+    score = yield / (1 + risk), normalize, clamp to min_alloc, renormalize
+    """
+    scores = yields / (1.0 + risks)
+    total = scores.sum()
+
+    if total == 0:
+        # Equal allocation if no scores
+        return np.full(yields.shape[0], 1.0 / yields.shape[0])
+
+    weights = scores / total
+    weights = np.maximum(weights, min_alloc)
+    return weights / weights.sum()
@@ -8,7 +8,10 @@ inference.py
 AI inference functions for yield prediction and risk analysis
 Loads trained models and makes predictions
 """
-import pickle
+import joblib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -28,36 +31,118 @@ except ImportError:
     
     from fetch_data import fetch_protocol_metrics
 
+try:
+    from ._ai_kernels import risk_adjust_allocate
+except ImportError:
+    from _ai_kernels import risk_adjust_allocate
+
 # Rest of your code stays the same...
 
-PROTOCOL_ENCODING = {
-    "Aave": 0,
-    "Morpho": 1,
-    "Spark": 2,
-    "Uniswap": 3
-}
+# Canonical protocol order - frozen at import so every consumer iterates
+# (and normalizes) in the same deterministic order
+PROTOCOLS = ("Aave", "Morpho", "Spark", "Uniswap")
+PROTOCOL_ENCODING = {protocol: idx for idx, protocol in enumerate(PROTOCOLS)}
+
+# Cached (yield_model, yield_scaler, risk_model, risk_scaler) tuple - loaded once
+_MODELS = None
+_MODELS_LOCK = threading.Lock()
 
 def load_models() -> Tuple:
-    """Load trained models from disk"""
-    models_dir = Path(__file__).parent.parent / "models"
-    
-    # Load yield predictor
-    with open(models_dir / "yield_predictor.pkl", "rb") as f:
-        yield_model, yield_scaler = pickle.load(f)
-    
-    # Load risk analyzer
-    with open(models_dir / "risk_analyzer.pkl", "rb") as f:
-        risk_model, risk_scaler = pickle.load(f)
-    
-    return yield_model, yield_scaler, risk_model, risk_scaler
+    """Load trained models from disk (cached after first call)"""
+    global _MODELS
 
-def predict_yield() -> Dict[str, float]:
+    if _MODELS is not None:
+        return _MODELS
+
+    with _MODELS_LOCK:
+        # Another thread may have loaded while we waited for the lock
+        if _MODELS is not None:
+            return _MODELS
+
+        models_dir = Path(__file__).parent.parent / "models"
+
+        # mmap_mode='r' maps the model arrays lazily and shares the pages
+        # across uvicorn workers instead of duplicating them per process
+        yield_model, yield_scaler = joblib.load(
+            models_dir / "yield_predictor.joblib", mmap_mode="r"
+        )
+        risk_model, risk_scaler = joblib.load(
+            models_dir / "risk_analyzer.joblib", mmap_mode="r"
+        )
+
+        _MODELS = (yield_model, yield_scaler, risk_model, risk_scaler)
+
+    return _MODELS
+
+def _quantize_features(df: pd.DataFrame) -> Tuple:
+    """
+    Build a hashable cache key from protocol metrics.
+    apy/volatility are rounded to 4 decimals so near-identical inputs
+    (e.g. the 3 model invocations within one /recommendation) hit the cache.
+    """
+    encoded = df["protocol"].map(PROTOCOL_ENCODING).to_numpy()
+    return tuple(
+        (e, round(a, 4), t, round(v, 4))
+        for e, a, t, v in zip(encoded, df["apy"], df["log_tvl"], df["volatility"])
+    )
+
+@lru_cache(maxsize=128)
+def _predict_yield_cached(features_key: Tuple) -> Tuple[float, ...]:
+    """Run the yield model on a quantized feature batch (cached)"""
+    yield_model, yield_scaler, _, _ = load_models()
+
+    rows = np.array(features_key)
+    features = np.column_stack([
+        rows[:, 0],
+        rows[:, 1],  # historical_apy
+        rows[:, 2],  # log(tvl), precomputed in fetch_data
+        rows[:, 3],
+        np.full(len(rows), 0.7)  # market_condition (mock)
+    ])
+
+    # float32 + C-contiguous so sklearn's kernels don't copy-reorder internally
+    features = np.ascontiguousarray(features, dtype=np.float32)
+
+    # Scale and predict once for the whole batch
+    features_scaled = yield_scaler.transform(features)
+    features_scaled = np.ascontiguousarray(features_scaled, dtype=np.float32)
+    assert features_scaled.flags["C_CONTIGUOUS"]
+    predicted_apys = yield_model.predict(features_scaled)
+
+    # Ensure non-negative
+    return tuple(np.maximum(0, predicted_apys).tolist())
+
+@lru_cache(maxsize=128)
+def _predict_risk_cached(features_key: Tuple) -> Tuple[float, ...]:
+    """Run the risk model on a quantized feature batch (cached)"""
+    _, _, risk_model, risk_scaler = load_models()
+
+    rows = np.array(features_key)
+    features = np.column_stack([
+        rows[:, 0],
+        rows[:, 1],
+        rows[:, 2],  # log(tvl), precomputed in fetch_data
+        rows[:, 3]
+    ])
+
+    features = np.ascontiguousarray(features, dtype=np.float32)
+
+    features_scaled = risk_scaler.transform(features)
+    features_scaled = np.ascontiguousarray(features_scaled, dtype=np.float32)
+    assert features_scaled.flags["C_CONTIGUOUS"]
+    risk_scores = risk_model.predict(features_scaled)
+
+    # Clamp to [0, 1]
+    return tuple(np.clip(risk_scores, 0, 1).tolist())
+
+def predict_yield(df: pd.DataFrame = None) -> Dict[str, float]:
     """
     Predict future yield (APY) for each protocol
+    Accepts an already-fetched metrics DataFrame to avoid duplicate fetches
     Returns dict mapping protocol name to predicted APY (as decimal)
     """
     try:
-        yield_model, yield_scaler, _, _ = load_models()
+        load_models()
     except FileNotFoundError:
         # Fallback to simple predictions if models not trained
         return {
@@ -67,40 +152,21 @@ def predict_yield() -> Dict[str, float]:
             "Uniswap": 0.065
         }
     
-    # Fetch current metrics
-    df = fetch_protocol_metrics()
-    
-    predictions = {}
-    
-    for _, row in df.iterrows():
-        protocol = row["protocol"]
-        protocol_encoded = PROTOCOL_ENCODING[protocol]
-        
-        # Prepare features
-        features = np.array([[
-            protocol_encoded,
-            row["apy"],  # historical_apy
-            np.log(row["tvl"]) if row["tvl"] > 0 else 0,  # log(tvl)
-            row["volatility"],
-            0.7  # market_condition (mock)
-        ]])
-        
-        # Scale and predict
-        features_scaled = yield_scaler.transform(features)
-        predicted_apy = yield_model.predict(features_scaled)[0]
-        
-        # Ensure non-negative
-        predictions[protocol] = max(0, predicted_apy)
-    
-    return predictions
+    # Fetch current metrics (unless provided) and predict on the quantized batch
+    if df is None:
+        df = fetch_protocol_metrics()
+    predicted_apys = _predict_yield_cached(_quantize_features(df))
 
-def predict_risk() -> Dict[str, float]:
+    return dict(zip(df["protocol"], predicted_apys))
+
+def predict_risk(df: pd.DataFrame = None) -> Dict[str, float]:
     """
     Predict risk scores for each protocol (0-1, lower is better)
+    Accepts an already-fetched metrics DataFrame to avoid duplicate fetches
     Returns dict mapping protocol name to risk score
     """
     try:
-        _, _, risk_model, risk_scaler = load_models()
+        load_models()
     except FileNotFoundError:
         # Fallback to simple risk scores
         return {
@@ -110,80 +176,67 @@ def predict_risk() -> Dict[str, float]:
             "Uniswap": 0.40
         }
     
-    df = fetch_protocol_metrics()
-    
-    risk_scores = {}
-    
-    for _, row in df.iterrows():
-        protocol = row["protocol"]
-        protocol_encoded = PROTOCOL_ENCODING[protocol]
-        
-        features = np.array([[
-            protocol_encoded,
-            row["apy"],
-            np.log(row["tvl"]) if row["tvl"] > 0 else 0,
-            row["volatility"]
-        ]])
-        
-        features_scaled = risk_scaler.transform(features)
-        risk_score = risk_model.predict(features_scaled)[0]
-        
-        # Clamp to [0, 1]
-        risk_scores[protocol] = max(0, min(1, risk_score))
-    
-    return risk_scores
+    if df is None:
+        df = fetch_protocol_metrics()
+    risk_scores = _predict_risk_cached(_quantize_features(df))
+
+    return dict(zip(df["protocol"], risk_scores))
 
-def compute_optimal_allocation() -> Dict[str, float]:
+# Executor used to overlap the yield and risk model dispatches; sklearn
+# releases the GIL inside its C kernels so the two predicts run concurrently
+_PREDICT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="predict")
+
+def predict_all(df: pd.DataFrame = None) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Predict yields and risks for the same metrics snapshot in one dispatch
+    The quantized feature key is built once and both models are scheduled
+    together so their sklearn calls overlap
+    Returns (yield predictions, risk scores)
+    """
+    try:
+        load_models()
+    except FileNotFoundError:
+        # Fall back to the static per-predictor defaults
+        return predict_yield(df), predict_risk(df)
+
+    if df is None:
+        df = fetch_protocol_metrics()
+
+    features_key = _quantize_features(df)
+    yield_future = _PREDICT_EXECUTOR.submit(_predict_yield_cached, features_key)
+    risk_future = _PREDICT_EXECUTOR.submit(_predict_risk_cached, features_key)
+
+    protocols = tuple(df["protocol"])
+    return (
+        dict(zip(protocols, yield_future.result())),
+        dict(zip(protocols, risk_future.result()))
+    )
+
+def compute_optimal_allocation(yields: Dict[str, float] = None,
+                               risks: Dict[str, float] = None) -> Dict[str, float]:
     """
     Compute optimal allocation weights based on yield predictions and risk
+    Callers that already have predictions can pass them in to avoid recomputing
     Returns dict mapping protocol name to allocation weight (0-1, sums to 1)
     """
-    yields = predict_yield()
-    risks = predict_risk()
-    
-    # Compute risk-adjusted yield (yield / risk)
-    risk_adjusted_scores = {}
-    for protocol in yields:
-        if risks[protocol] > 0:
-            risk_adjusted_scores[protocol] = yields[protocol] / (1 + risks[protocol])
-        else:
-            risk_adjusted_scores[protocol] = yields[protocol]
-    
-    # Normalize to get allocation weights (sum to 1.0)
-    total_score = sum(risk_adjusted_scores.values())
-    
-    if total_score == 0:
-        # Equal allocation if no scores
-        return {protocol: 0.25 for protocol in yields.keys()}
-    
-    allocation = {
-        protocol: score / total_score
-        for protocol, score in risk_adjusted_scores.items()
-    }
-    
-    # Ensure minimum 5% allocation per protocol (diversification)
-    min_allocation = 0.05
-    allocation_adjusted = {}
-    excess = 0
-    
-    for protocol, weight in allocation.items():
-        if weight < min_allocation:
-            excess += (min_allocation - weight)
-            allocation_adjusted[protocol] = min_allocation
-        else:
-            allocation_adjusted[protocol] = weight
-    
-    # Redistribute excess proportionally
-    if excess > 0:
-        total_above_min = sum(w for w in allocation.values() if w >= min_allocation)
-        if total_above_min > 0:
-            for protocol in allocation_adjusted:
-                if allocation[protocol] >= min_allocation:
-                    allocation_adjusted[protocol] += excess * (allocation[protocol] / total_above_min)
-    
-    # Normalize again to ensure sum = 1.0
-    total = sum(allocation_adjusted.values())
-    return {protocol: w / total for protocol, w in allocation_adjusted.items()}
+    if yields is None and risks is None:
+        yields, risks = predict_all()
+    elif yields is None or risks is None:
+        # Fetch once and share the same metrics across both predictors
+        df = fetch_protocol_metrics()
+        if yields is None:
+            yields = predict_yield(df)
+        if risks is None:
+            risks = predict_risk(df)
+
+    y = np.fromiter((yields[p] for p in PROTOCOLS), dtype=np.float64, count=len(PROTOCOLS))
+    r = np.fromiter((risks[p] for p in PROTOCOLS), dtype=np.float64, count=len(PROTOCOLS))
+
+    # Risk-adjust, clamp to 5% minimum (diversification) and renormalize -
+    # compiled kernel, JIT cost is paid once and cached across workers
+    weights = risk_adjust_allocate(y, r, 0.05)
+
+    return dict(zip(PROTOCOLS, weights.tolist()))
 
 if __name__ == "__main__":
     print("Yield Predictions:")
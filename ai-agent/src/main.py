@@ -3,7 +3,10 @@ main.py
 FastAPI server exposing AI endpoints for yield prediction and allocation recommendations
 Frontend and StrategyManager (via oracle) can call these endpoints
 """
+import asyncio
 import os
+import time
+import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -48,6 +51,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# In-process TTL cache for whole endpoint responses. Metrics only move by
+# sub-0.1% noise within a couple of seconds, so polling clients can share
+# one computed response. Note: per uvicorn worker, not shared across them.
+_RESPONSE_CACHE: Dict[str, tuple] = {}
+_RESPONSE_TTL = 2.0  # seconds
+
+def _cache_get(key: str) -> Optional[dict]:
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _RESPONSE_TTL:
+        return entry[1]
+    return None
+
+def _cache_put(key: str, value: dict) -> None:
+    _RESPONSE_CACHE[key] = (time.monotonic(), value)
+
 class AllocationWeights(BaseModel):
     """Allocation weights in basis points (e.g., 4000 = 40%)"""
     aave: int
@@ -68,6 +86,15 @@ class RiskResponse(BaseModel):
     overall_risk: str  # "low", "medium", "high"
     recommendation: str
 
+@app.on_event("startup")
+async def load_models_on_startup():
+    """Load models once at startup so requests never touch disk"""
+    try:
+        inference.load_models()
+    except FileNotFoundError:
+        # Models not trained yet - inference falls back to static predictions
+        pass
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -94,10 +121,21 @@ async def get_recommendation():
     - confidence: Model confidence (0-1)
     """
     try:
-        # Get predictions from AI model
-        optimal_allocation = inference.compute_optimal_allocation()
-        predicted_yields = inference.predict_yield()
-        risk_scores = inference.predict_risk()
+        # Serve from the TTL cache if a fresh response exists
+        if (cached := _cache_get("recommendation")) is not None:
+            return RecommendationResponse(**cached)
+
+        # Fetch metrics once and share them across both predictors
+        df = await asyncio.to_thread(inference.fetch_protocol_metrics)
+
+        # Get predictions from AI model (computed once, reused for allocation)
+        # predict_all overlaps both model dispatches off the event loop
+        predicted_yields, risk_scores = await asyncio.to_thread(
+            inference.predict_all, df
+        )
+        optimal_allocation = inference.compute_optimal_allocation(
+            yields=predicted_yields, risks=risk_scores
+        )
         
         # Convert allocation (0-1) to basis points (0-10000)
         allocation = AllocationWeights(
@@ -118,17 +156,21 @@ async def get_recommendation():
             allocation.uniswap = int(allocation.uniswap * factor)
         
         # Calculate confidence based on prediction variance
-        yield_values = list(predicted_yields.values())
-        variance = sum((y - sum(yield_values)/len(yield_values))**2 for y in yield_values) / len(yield_values)
-        confidence = max(0, min(1, 1 - variance * 100))  # Lower variance = higher confidence
+        yield_arr = np.fromiter(
+            predicted_yields.values(), dtype=np.float64, count=len(predicted_yields)
+        )
+        variance = float(yield_arr.var())
+        confidence = float(np.clip(1 - variance * 100, 0, 1))  # Lower variance = higher confidence
         
-        return RecommendationResponse(
+        response = RecommendationResponse(
             allocation=allocation,
             predicted_yields=predicted_yields,
             risk_scores=risk_scores,
             confidence=confidence
         )
-    
+        _cache_put("recommendation", response.model_dump())
+        return response
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating recommendation: {str(e)}")
 
@@ -143,8 +185,11 @@ async def get_risk_analysis():
     - recommendation: Text recommendation
     """
     try:
-        risk_scores = inference.predict_risk()
-        
+        if (cached := _cache_get("risk")) is not None:
+            return RiskResponse(**cached)
+
+        risk_scores = await asyncio.to_thread(inference.predict_risk)
+
         # Calculate overall risk (average, weighted by allocation if available)
         avg_risk = sum(risk_scores.values()) / len(risk_scores)
         
@@ -158,12 +203,14 @@ async def get_risk_analysis():
             overall_risk = "high"
             recommendation = "Portfolio risk is high. Consider diversifying to lower-risk protocols."
         
-        return RiskResponse(
+        response = RiskResponse(
             risk_scores=risk_scores,
             overall_risk=overall_risk,
             recommendation=recommendation
         )
-    
+        _cache_put("risk", response.model_dump())
+        return response
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing risk: {str(e)}")
 
@@ -175,7 +222,7 @@ async def get_yield_predictions():
     Returns dict mapping protocol name to predicted APY (decimal)
     """
     try:
-        yields = inference.predict_yield()
+        yields = await asyncio.to_thread(inference.predict_yield)
         return {
             "predicted_yields": yields,
             "timestamp": inference.pd.Timestamp.now().isoformat()
@@ -200,7 +247,7 @@ async def get_historical_yields(protocol: str, days: int = 30):
         import pandas as pd
         
         # Validate protocol name (case-insensitive)
-        valid_protocols = ["Aave", "Morpho", "Spark", "Uniswap"]
+        valid_protocols = list(inference.PROTOCOLS)
         protocol_capitalized = protocol.capitalize()
         
         if protocol_capitalized not in valid_protocols:
@@ -212,17 +259,15 @@ async def get_historical_yields(protocol: str, days: int = 30):
         # Fetch historical data
         historical_yields = fetch_historical_yield(protocol_capitalized, days)
         
-        # Create timestamps for the data
-        end_date = pd.Timestamp.now()
-        dates = [end_date - pd.Timedelta(days=i) for i in range(days-1, -1, -1)]
-        
+        # Create timestamps for the data in one vectorized pass
+        dates = pd.date_range(
+            end=pd.Timestamp.now().normalize(), periods=days, freq="D"
+        ).strftime("%Y-%m-%dT%H:%M:%S").tolist()
+
         return {
             "protocol": protocol_capitalized,
             "data": [
-                {
-                    "date": date.isoformat(),
-                    "yield": float(yield_value)
-                }
+                {"date": date, "yield": float(yield_value)}
                 for date, yield_value in zip(dates, historical_yields)
             ],
             "days": days
@@ -243,4 +288,14 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # One worker per core with uvloop/httptools so sklearn predicts don't
+    # serialize across clients. Models load post-fork in the startup handler;
+    # note the lru/TTL caches are per worker, not shared.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count(),
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
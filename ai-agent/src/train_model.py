@@ -5,10 +5,10 @@ For hackathon, uses simple regression models with mock data
 """
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-import pickle
+import joblib
 import os
 from pathlib import Path
 
@@ -22,47 +22,38 @@ def generate_training_data(n_samples: int = 1000) -> pd.DataFrame:
     - volatility
     - market_condition (0-1)
     """
-    np.random.seed(42)
-    
+    rng = np.random.default_rng(42)
+
     protocols = ["Aave", "Morpho", "Spark", "Uniswap"]
-    data = []
-    
-    for _ in range(n_samples):
-        protocol_idx = np.random.randint(0, len(protocols))
-        protocol = protocols[protocol_idx]
-        
-        # Base APY varies by protocol
-        base_apy = {
-            "Aave": 0.072,
-            "Morpho": 0.068,
-            "Spark": 0.070,
-            "Uniswap": 0.065
-        }[protocol]
-        
-        historical_apy = base_apy + np.random.normal(0, 0.01)
-        tvl = np.random.lognormal(15, 0.5)
-        volatility = np.random.uniform(0.10, 0.25)
-        market_condition = np.random.uniform(0, 1)
-        
-        # Target: future APY (with some relationship to features)
-        future_apy = (
-            base_apy +
-            0.3 * (historical_apy - base_apy) +
-            0.1 * np.log(tvl) / 20 -
-            0.2 * volatility +
-            np.random.normal(0, 0.005)
-        )
-        
-        data.append({
-            "protocol_encoded": protocol_idx,
-            "historical_apy": historical_apy,
-            "tvl": np.log(tvl),  # Log transform for better distribution
-            "volatility": volatility,
-            "market_condition": market_condition,
-            "target_apy": future_apy
-        })
-    
-    return pd.DataFrame(data)
+
+    # Base APY varies by protocol
+    base_apys = np.array([0.072, 0.068, 0.070, 0.065])
+
+    # Draw all samples at once instead of looping row by row
+    protocol_idx = rng.integers(0, len(protocols), n_samples)
+    base_apy = base_apys[protocol_idx]
+    historical_apy = base_apy + rng.normal(0, 0.01, n_samples)
+    tvl = rng.lognormal(15, 0.5, n_samples)
+    volatility = rng.uniform(0.10, 0.25, n_samples)
+    market_condition = rng.uniform(0, 1, n_samples)
+
+    # Target: future APY (with some relationship to features)
+    future_apy = (
+        base_apy +
+        0.3 * (historical_apy - base_apy) +
+        0.1 * np.log(tvl) / 20 -
+        0.2 * volatility +
+        rng.normal(0, 0.005, n_samples)
+    )
+
+    return pd.DataFrame({
+        "protocol_encoded": protocol_idx,
+        "historical_apy": historical_apy,
+        "tvl": np.log(tvl),  # Log transform for better distribution
+        "volatility": volatility,
+        "market_condition": market_condition,
+        "target_apy": future_apy
+    })
 
 def train_yield_predictor() -> tuple:
     """
@@ -79,11 +70,17 @@ def train_yield_predictor() -> tuple:
     # Scale features
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
-    
-    # Train model (Random Forest for non-linearity)
-    model = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
-    model.fit(X_scaled, y)
-    
+    X_scaled = X_scaled.astype(np.float32, order="C")  # match inference dtype
+
+    # Train model (the generated target is linear in the features, so Ridge
+    # matches the data while predicting in microseconds and pickling tiny)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_scaled, y, test_size=0.2, random_state=42
+    )
+    model = Ridge(alpha=1.0)
+    model.fit(X_train, y_train)
+    print(f"Yield predictor held-out R^2: {model.score(X_test, y_test):.4f}")
+
     return model, scaler
 
 def train_risk_analyzer() -> tuple:
@@ -92,12 +89,13 @@ def train_risk_analyzer() -> tuple:
     Returns (model, scaler)
     """
     df = generate_training_data(1000)
-    
+    rng = np.random.default_rng(42)
+
     # Risk score is inversely related to APY stability and TVL
     df["risk_score"] = (
         0.3 * df["volatility"] +
         0.2 * (1 - df["tvl"] / df["tvl"].max()) +
-        0.5 * np.random.uniform(0.2, 0.5, len(df))
+        0.5 * rng.uniform(0.2, 0.5, len(df))
     )
     
     X = df[["protocol_encoded", "historical_apy", "tvl", "volatility"]]
@@ -105,7 +103,8 @@ def train_risk_analyzer() -> tuple:
     
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
-    
+    X_scaled = X_scaled.astype(np.float32, order="C")  # match inference dtype
+
     model = LinearRegression()
     model.fit(X_scaled, y)
     
@@ -116,17 +115,15 @@ def save_models():
     models_dir = Path(__file__).parent.parent / "models"
     models_dir.mkdir(exist_ok=True)
     
-    # Train and save yield predictor
+    # Train and save yield predictor (uncompressed so arrays can be mmap'd)
     yield_model, yield_scaler = train_yield_predictor()
-    with open(models_dir / "yield_predictor.pkl", "wb") as f:
-        pickle.dump((yield_model, yield_scaler), f)
-    print("Saved yield_predictor.pkl")
-    
+    joblib.dump((yield_model, yield_scaler), models_dir / "yield_predictor.joblib", compress=0)
+    print("Saved yield_predictor.joblib")
+
     # Train and save risk analyzer
     risk_model, risk_scaler = train_risk_analyzer()
-    with open(models_dir / "risk_analyzer.pkl", "wb") as f:
-        pickle.dump((risk_model, risk_scaler), f)
-    print("Saved risk_analyzer.pkl")
+    joblib.dump((risk_model, risk_scaler), models_dir / "risk_analyzer.joblib", compress=0)
+    print("Saved risk_analyzer.joblib")
 
 if __name__ == "__main__":
     save_models()